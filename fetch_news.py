@@ -13,39 +13,106 @@
 改进要点：
 - JST 时区与“近 N 天”过滤（避免 offset-naive 错误）
 - PubMed 文章的封面：优先抓期刊原站的 og:image，退化到站点图标
+- 摘要由 efetch 批量获取；逐条的封面请求用线程池并发，避免串行等待网络
 """
 
 from __future__ import annotations
 
+import io
 import os
 import re
-import json
+import pickle
+import functools
 import time
-import hashlib
 import logging
+import threading
 import datetime as dt
-from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
-from urllib.parse import urlencode, urljoin, urlparse, quote_plus
+from urllib.parse import urlencode, urljoin, urlparse, quote, quote_plus
 
+import orjson
 import requests
-import feedparser
-from bs4 import BeautifulSoup
+import xxhash
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util.retry import Retry
+from lxml import etree
+from pybloom_live import ScalableBloomFilter
+from selectolax.lexbor import LexborHTMLParser
 
 # ========== 配置 ==========
 JST = dt.timezone(dt.timedelta(hours=9))  # 日本时区
-UA = {"User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123 Safari/537.36"}
+UA = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123 Safari/537.36",
+    # br 需要安装 brotli，requests/urllib3 才能自动解压
+    "Accept-Encoding": "gzip, br, deflate",
+}
 
 OUT_DIR = "public/data"
+CACHE_DIR = ".cache"       # HTTP 缓存 / 已发布记录放在 public 之外，避免被发布到 Pages
+CACHE_MAX_AGE_DAYS = 30    # 超过这个天数的缓存响应在每次运行结束时清掉
 
 # 控制抓取规模
 DAYS_LOOKBACK = 3          # 近 N 天（针对 PubMed / arXiv）
 MAX_PER_SECTION = 40       # 每个模块最多条数（避免过长）
 TIMEOUT = 12
+EFETCH_BATCH = 200         # EFetch 每次最多提交的 PMID 数
+OG_PROBE_BYTES = 16384     # 抓 og:image 时只读页面前 16 KB（<meta> 基本都在 <head>）
+FETCH_CONCURRENCY = 8      # 逐条抓封面时的并发数
 
 # 是否启用 arXiv 作为补充
 ENABLE_ARXIV = True
 
+_WS_RE = re.compile(r"\s+")
+_DATE_RE = re.compile(r"(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})")
+ATOM_NS = {"a": "http://www.w3.org/2005/Atom"}
+
+# NCBI E-utilities：有 API key 时官方限速 10 次/秒，否则 3 次/秒
+EUTILS = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+NCBI_API_KEY = os.environ.get("NCBI_API_KEY", "")
+NCBI_RATE = 10 if NCBI_API_KEY else 3
+
+# 只有这些出版商值得去原站抓 og:image，其余直接用站点图标（零额外请求）
+PUBLISHER_WHITELIST = {
+    "nature.com", "cell.com", "science.org", "nejm.org",
+    "thelancet.com", "bmj.com", "plos.org", "oup.com",
+}
+
+# 全局共享连接池：同一主机复用 TCP/TLS 连接，失败时自动重试
+# （429 不在这里重试，E-utilities 的 429 由 eutils_get 按 Retry-After 处理）
+# 带 SQLite 磁盘缓存：每天的运行之间大量 PMID / 原站页面重复，命中即不走网络
+SESSION = CachedSession(
+    os.path.join(CACHE_DIR, "http_cache.sqlite"),
+    expire_after=86400,
+    urls_expire_after={
+        "eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi*": 3600,
+        "eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi*": 86400,
+        "eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi*": 86400 * 7,
+        "export.arxiv.org/api/query*": 3600,
+        "www.google.com/s2/favicons*": 86400 * 30,
+    },
+    allowable_methods=["GET"],
+    ignored_parameters=["api_key"],
+    stale_if_error=True,
+)
+SESSION.headers.update(UA)
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504]),
+)
+SESSION.mount("https://", _ADAPTER)
+SESSION.mount("http://", _ADAPTER)
+
+# og:image 探测专用的无缓存会话：requests-cache 即使 stream=True 也会读完整个正文，
+# 只有普通 Session 才能读够 OG_PROBE_BYTES 就断开
+PROBE_SESSION = requests.Session()
+PROBE_SESSION.headers.update(UA)
+PROBE_SESSION.mount("https://", _ADAPTER)
+PROBE_SESSION.mount("http://", _ADAPTER)
+
 
 # ========== 数据模型 ==========
 @dataclass
@@ -71,97 +138,271 @@ def iso_date(s: str) -> str:
         return dt.date.fromisoformat(s[:10]).isoformat()
     except Exception:
         # 尝试常见格式
-        m = re.search(r"(\d{4})[-/\.](\d{1,2})[-/\.](\d{1,2})", s)
+        m = _DATE_RE.search(s)
         if m:
             y, mo, d = map(int, m.groups())
             return dt.date(y, mo, d).isoformat()
         return s[:10]
 
 
-def within_days(date_str: str, days: int) -> bool:
-    """判断 date_str 是否在近 N 天（JST）"""
+def cutoff_date_str(days: int) -> str:
+    """近 N 天（JST）的起始日期 YYYY-MM-DD；time 字段都是 ISO 日期，直接按字符串比较即可"""
+    return (dt.datetime.now(JST).date() - dt.timedelta(days=max(days, 0))).isoformat()
+
+
+@functools.lru_cache(maxsize=4096)
+def _netloc(url: str) -> str:
+    """小写主机名（带缓存：同一批 URL 会被多处反复解析）"""
     try:
-        d = dt.date.fromisoformat(date_str[:10])
+        return urlparse(url).netloc.lower()
     except Exception:
-        return True  # 解析失败就保留
-    today = dt.datetime.now(JST).date()
-    return (today - d).days <= max(days, 0)
+        return ""
 
 
-def md5(s: str) -> str:
-    return hashlib.md5(s.encode("utf-8", "ignore")).hexdigest()[:16]
+def short_id(s: str) -> str:
+    """稳定的 16 位十六进制 ID（非加密用途，用 xxh3 即可）"""
+    return xxhash.xxh3_64(s.encode("utf-8", "ignore")).hexdigest()
 
 
 def safe_get(url: str, **kwargs) -> Optional[requests.Response]:
+    throttle_ncbi(url)
     try:
-        r = requests.get(url, headers=UA, timeout=kwargs.get("timeout", TIMEOUT), allow_redirects=True)
-        r.raise_for_status()
-        return r
+        r = SESSION.get(url, timeout=kwargs.get("timeout", TIMEOUT), allow_redirects=True, stream=False)
     except Exception:
         return None
+    # stream=False 时正文已读完，close() 只是把连接还给连接池
+    r.close()
+    if not r.ok:
+        return None
+    return r
+
+
+class RateLimiter:
+    """令牌桶限速（桶容量 1）：多线程共享，保证请求间隔不小于 1/rate_per_sec"""
+
+    def __init__(self, rate_per_sec: float):
+        self.interval = 1.0 / rate_per_sec
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def defer(self, seconds: float) -> None:
+        """服务端要求退避时，让所有线程的下一个令牌都推迟 seconds 秒"""
+        with self._lock:
+            self._next = max(self._next, time.monotonic() + seconds)
+
+
+NCBI_LIMITER = RateLimiter(NCBI_RATE)
+
+
+def is_ncbi(url: str) -> bool:
+    host = _netloc(url)
+    return host == "ncbi.nlm.nih.gov" or host.endswith(".ncbi.nlm.nih.gov")
+
+
+def is_cached(url: str) -> bool:
+    """SQLite 缓存里有未过期的 GET 响应（命中时不会真正发请求）"""
+    try:
+        key = SESSION.cache.create_key(SESSION.prepare_request(requests.Request("GET", url)))
+        resp = SESSION.cache.get_response(key)
+    except Exception:
+        return False
+    return resp is not None and not resp.is_expired
+
+
+def throttle_ncbi(url: str) -> None:
+    """NCBI 主机（E-utilities 与 PubMed 网页）的真实网络请求先取令牌；缓存命中不占令牌"""
+    if is_ncbi(url) and not is_cached(url):
+        NCBI_LIMITER.acquire()
+
+
+def eutils_get(endpoint: str, params: Dict[str, str], retries: int = 3) -> Optional[requests.Response]:
+    """调用 E-utilities：统一附加 api_key、限速，并按 Retry-After 处理 429"""
+    if NCBI_API_KEY:
+        params = {**params, "api_key": NCBI_API_KEY}
+    url = f"{EUTILS}/{endpoint}?{urlencode(params)}"
+    for attempt in range(retries + 1):
+        throttle_ncbi(url)
+        try:
+            r = SESSION.get(url, timeout=TIMEOUT, stream=False)
+        except Exception:
+            return None
+        r.close()
+        if r.status_code == 429 and attempt < retries:
+            try:
+                delay = float(r.headers.get("Retry-After", "1"))
+            except ValueError:
+                delay = 1.0
+            NCBI_LIMITER.defer(max(delay, 1.0) * (2 ** attempt))
+            continue
+        # 缓存命中时 requests-cache 会回放当时的响应头，不代表现在的配额：既不取令牌也不退避
+        if r.headers.get("X-RateLimit-Remaining") == "0" and not getattr(r, "from_cache", False):
+            NCBI_LIMITER.defer(1.0)
+        return r if r.ok else None
+    return None
 
 
 # ========== 封面抓取（期刊原站优先） ==========
-def get_og_image(url: str) -> Optional[str]:
-    """优先取 og:image / twitter:image；拿不到用站点图标兜底"""
-    r = safe_get(url)
-    if r is None:
-        return None
-    soup = BeautifulSoup(r.text, "lxml")
+def favicon_url(host: str) -> str:
+    return f"https://www.google.com/s2/favicons?sz=256&domain={host}"
+
+
+def is_whitelisted(host: str) -> bool:
+    return any(host == d or host.endswith("." + d) for d in PUBLISHER_WHITELIST)
+
+
+def resolve_url(url: str) -> str:
+    """HEAD 跟随跳转（doi.org / linkinghub 等），得到最终落地页；失败则原样返回"""
+    if is_ncbi(url):  # 例如指向 PMC 的全文链接；HEAD 不走缓存，每次都占令牌
+        NCBI_LIMITER.acquire()
+    try:
+        r = SESSION.head(url, timeout=TIMEOUT, allow_redirects=True)
+        r.close()
+        return r.url or url
+    except Exception:
+        return url
+
+
+# 某主机已经退化成站点图标（页面没有 og:image），本次运行里同主机的其他文章不再去抓
+_FAVICON_BY_HOST: Dict[str, str] = {}
+
+
+def og_image_in(html: str | bytes, base_url: str) -> Optional[str]:
+    """从 HTML（可以是截断的原始字节）里找 og:image / twitter:image"""
+    tree = LexborHTMLParser(html)
     for selector in ("meta[property='og:image']", "meta[name='twitter:image']"):
-        tag = soup.select_one(selector)
-        if tag and tag.get("content"):
-            return urljoin(r.url, tag["content"].strip())
-    # 兜底：站点图标（至少每家期刊不一样）
+        tag = tree.css_first(selector)
+        content = (tag.attributes.get("content") or "").strip() if tag else ""
+        if content:
+            return urljoin(base_url, content)
+    return None
+
+
+def probe_html(url: str) -> Optional[tuple[str, bytes]]:
+    """用 Range 只取页面开头 OG_PROBE_BYTES 字节，返回 (最终 URL, 正文前缀)"""
+    if is_ncbi(url):  # PROBE_SESSION 不走缓存，每次都占令牌
+        NCBI_LIMITER.acquire()
     try:
-        host = urlparse(r.url).netloc
-        return f"https://www.google.com/s2/favicons?sz=256&domain={host}"
+        r = PROBE_SESSION.get(url, headers={"Range": f"bytes=0-{OG_PROBE_BYTES - 1}"},
+                              timeout=TIMEOUT, allow_redirects=True, stream=True)
     except Exception:
         return None
+    try:
+        if r.status_code not in (200, 206):  # 206 Partial Content；不支持 Range 的站点回 200
+            return None
+        body = b""
+        for chunk in r.iter_content(chunk_size=8192):
+            body += chunk
+            if len(body) >= OG_PROBE_BYTES:
+                break
+        return r.url, body[:OG_PROBE_BYTES]
+    except Exception:
+        return None
+    finally:
+        r.close()
 
 
-def best_cover_for(url: str) -> Optional[str]:
-    """如果是 PubMed，先到 Full text links 找期刊原站；否则直接取当前页 og:image。"""
-    host = urlparse(url).netloc.lower()
-    if "pubmed.ncbi.nlm.nih.gov" in host:
-        # 1) 找 PubMed 页面里的 Full text links
+@functools.lru_cache(maxsize=1024)
+def get_og_image(url: str) -> Optional[str]:
+    """优先取 og:image / twitter:image；拿不到用站点图标兜底（按 URL 缓存）"""
+    probe = probe_html(url)
+    if probe is None:
+        return None
+    final_url, head = probe
+    img = og_image_in(head, final_url)
+    if img:
+        return img
+    # 前缀被截断且没找到：再完整 GET 一次
+    if len(head) >= OG_PROBE_BYTES:
         r = safe_get(url)
         if r is not None:
-            soup = BeautifulSoup(r.text, "lxml")
-            a = soup.select_one("section.full-text-links a[href]")
-            if a and a.get("href"):
-                fulltext = urljoin(r.url, a["href"])
-                img = get_og_image(fulltext)
+            final_url = r.url
+            img = og_image_in(r.content, final_url)
+            if img:
+                return img
+    # 兜底：站点图标（至少每家期刊不一样）
+    fav = favicon_url(_netloc(final_url))
+    _FAVICON_BY_HOST[_netloc(url)] = fav
+    return fav
+
+
+def cover_for_page(url: str) -> Optional[str]:
+    """白名单出版商抓 og:image；其他站点直接给站点图标，不再发请求"""
+    host = _netloc(url)
+    if host in _FAVICON_BY_HOST:
+        return _FAVICON_BY_HOST[host]
+    if is_whitelisted(host):
+        return get_og_image(url)
+    return favicon_url(host)
+
+
+def best_cover_for(url: str, doi: str = "") -> Optional[str]:
+    """
+    如果是 PubMed：有 DOI 就经 doi.org 一次 HEAD 解析出期刊原站；没有 DOI 才去 PubMed 页面
+    找 Full text links。否则直接按当前页处理。
+    """
+    host = _netloc(url)
+    if "pubmed.ncbi.nlm.nih.gov" in host:
+        if doi:
+            # 1) DOI（来自 efetch XML）→ doi.org 跳转到期刊原站，不再请求 PubMed 页面
+            landing = resolve_url(f"https://doi.org/{quote(doi, safe='/')}")
+            if _netloc(landing) != "doi.org":
+                img = cover_for_page(landing)
                 if img:
                     return img
+        else:
+            # 1') 没有 DOI：找 PubMed 页面里的 Full text links，HEAD 解析出期刊原站
+            r = safe_get(url)
+            if r is not None:
+                a = LexborHTMLParser(r.content).css_first("section.full-text-links a[href]")
+                href = (a.attributes.get("href") or "").strip() if a else ""
+                if href:
+                    fulltext = resolve_url(urljoin(r.url, href))
+                    img = cover_for_page(fulltext)
+                    if img:
+                        return img
         # 2) 回退：PubMed 页面的 og:image（通常是蓝色 NIH 图）
         img = get_og_image(url)
         if img:
             return img
         return None
     else:
-        return get_og_image(url)
+        return cover_for_page(url)
 
 
 def clean_abs(txt: str, limit: int = 800) -> str:
     if not txt:
         return ""
-    t = re.sub(r"\s+", " ", txt).strip()
+    t = _WS_RE.sub(" ", txt).strip()
     return t if len(t) <= limit else (t[:limit].rstrip() + "…")
 
 
 # ========== PubMed 抓取 ==========
-def search_pubmed(query: str, retmax: int = 50) -> List[str]:
-    """用 E-utilities esearch 抓到 PMID 列表"""
+def pubmed_url(pmid: str) -> str:
+    return f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
+
+
+def search_pubmed(query: str, days: int, retmax: int = 50) -> List[str]:
+    """用 E-utilities esearch 抓到 PMID 列表（服务端按出版日期只取近 N 天）"""
+    today = dt.datetime.now(JST).date()
     params = {
         "db": "pubmed",
         "term": query,
         "retmode": "json",
         "retmax": str(retmax),
         "sort": "most+recent",
+        "datetype": "pdat",
+        "mindate": (today - dt.timedelta(days=max(days, 0))).strftime("%Y/%m/%d"),
+        "maxdate": today.strftime("%Y/%m/%d"),
     }
-    url = f"https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi?{urlencode(params)}"
-    r = safe_get(url)
+    r = eutils_get("esearch.fcgi", params)
     if r is None:
         return []
     try:
@@ -172,16 +413,16 @@ def search_pubmed(query: str, retmax: int = 50) -> List[str]:
 
 
 def fetch_pubmed_summaries(pmids: List[str]) -> List[Dict[str, Any]]:
-    """用 esummary 抓取题目、来源、时间；再配合网页取摘要"""
+    """用 esummary 抓取题目、来源、时间；摘要另由 efetch 批量获取"""
     if not pmids:
         return []
     params = {
         "db": "pubmed",
         "id": ",".join(pmids),
         "retmode": "json",
+        "version": "2.0",
     }
-    url = f"https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi?{urlencode(params)}"
-    r = safe_get(url)
+    r = eutils_get("esummary.fcgi", params)
     if r is None:
         return []
     try:
@@ -192,9 +433,10 @@ def fetch_pubmed_summaries(pmids: List[str]) -> List[Dict[str, Any]]:
                 continue
             title = v.get("title") or ""
             journal = v.get("fulljournalname") or v.get("source") or ""
-            date = v.get("pubdate") or v.get("epubdate") or v.get("sortpubdate") or ""
+            # sortpubdate 是结构化的 YYYY/MM/DD HH:MM；pubdate 形如 "2025 Sep 18" 难以解析
+            date = v.get("sortpubdate") or v.get("pubdate") or v.get("epubdate") or ""
             date_iso = iso_date(date) if date else today_jst_str()
-            url_pub = f"https://pubmed.ncbi.nlm.nih.gov/{k}/"
+            url_pub = pubmed_url(k)
             res.append({
                 "pmid": k,
                 "title": title.strip(),
@@ -207,38 +449,68 @@ def fetch_pubmed_summaries(pmids: List[str]) -> List[Dict[str, Any]]:
         return []
 
 
-def fetch_pubmed_abstract(url_pubmed: str) -> str:
-    """从 PubMed 网页抓 Abstract 文本"""
-    r = safe_get(url_pubmed)
-    if r is None:
-        return ""
-    soup = BeautifulSoup(r.text, "lxml")
-    abs_div = soup.select_one("div.abstract-content")
-    if abs_div:
-        return clean_abs(abs_div.get_text(" ", strip=True))
-    # 某些条目用不同结构
-    abs2 = soup.select_one("div#abstract")
-    if abs2:
-        return clean_abs(abs2.get_text(" ", strip=True))
-    return ""
+def fetch_pubmed_abstracts_bulk(pmids: List[str]) -> Dict[str, Dict[str, str]]:
+    """用 efetch 批量取摘要和 DOI（XML），一次请求覆盖一批 PMID，返回 {pmid: {"abstract", "doi"}}"""
+    out: Dict[str, Dict[str, str]] = {}
+    for i in range(0, len(pmids), EFETCH_BATCH):
+        chunk = pmids[i:i + EFETCH_BATCH]
+        params = {
+            "db": "pubmed",
+            "id": ",".join(chunk),
+            "rettype": "abstract",
+            "retmode": "xml",
+        }
+        r = eutils_get("efetch.fcgi", params)
+        if r is None:
+            continue
+        # lxml 的 parser 不能跨线程共享，每次新建（开销很小）
+        parser = etree.XMLParser(recover=True, huge_tree=False, resolve_entities=False)
+        try:
+            root = etree.fromstring(r.content, parser=parser)
+        except etree.XMLSyntaxError:
+            continue
+        if root is None:
+            continue
+        for art in root.iterfind("PubmedArticle"):
+            pmid = (art.findtext("MedlineCitation/PMID") or "").strip()
+            if not pmid:
+                continue
+            parts = []
+            for node in art.iterfind(".//AbstractText"):
+                text = "".join(node.itertext()).strip()
+                label = node.get("Label")
+                parts.append(f"{label.capitalize()}: {text}" if label else text)
+            doi = (art.findtext("PubmedData/ArticleIdList/ArticleId[@IdType='doi']") or "").strip()
+            out[pmid] = {"abstract": clean_abs(" ".join(parts)), "doi": doi}
+    return out
 
 
 def build_pubmed_items(query: str, days: int, limit: int, extra_tags: List[str]|None=None) -> List[Item]:
-    pmids = search_pubmed(query, retmax=min(100, limit*2))
+    pmids = search_pubmed(query, days, retmax=min(100, limit*2))
+    pmids = [p for p in pmids if not SEEN.seen_before(pubmed_url(p))]  # 前几天已发布过的不再抓
     summaries = fetch_pubmed_summaries(pmids)
+    # esearch 已按日期过滤，这里保留一道兜底（pdat 与 sortpubdate 偶有出入）
+    cutoff = cutoff_date_str(days)
+    picked = [s for s in summaries if s["time"] >= cutoff][:limit]
+
+    details = fetch_pubmed_abstracts_bulk([s["pmid"] for s in picked])
+
+    # 封面是纯网络 I/O，用线程池并发抓取
+    with ThreadPoolExecutor(max_workers=FETCH_CONCURRENCY) as pool:
+        covers = list(pool.map(
+            lambda s: best_cover_for(s["url"], details.get(s["pmid"], {}).get("doi", "")) or "",
+            picked,
+        ))
+
     items: List[Item] = []
-    for s in summaries:
-        if not within_days(s["time"], days):
-            continue
-        abstract = fetch_pubmed_abstract(s["url"])  # 逐条抓摘要（最稳）
-        cover = best_cover_for(s["url"]) or ""
+    for s, cover in zip(picked, covers):
         tags = ["Peer-reviewed"]
         if extra_tags:
             tags.extend(extra_tags)
         it = Item(
-            id=md5(s["url"]),
+            id=short_id(s["url"]),
             title=s["title"],
-            summary=abstract,
+            summary=details.get(s["pmid"], {}).get("abstract", ""),
             url=s["url"],
             cover=cover,
             source=s["source"],
@@ -246,8 +518,6 @@ def build_pubmed_items(query: str, days: int, limit: int, extra_tags: List[str]|
             tags=tags
         )
         items.append(it)
-        if len(items) >= limit:
-            break
     return items
 
 
@@ -256,7 +526,7 @@ def fetch_arxiv(query: str, days: int, limit: int, extra_tags: List[str]|None=No
     """
     使用 arXiv API。注意 arXiv 时间是 UTC，近 N 天按 JST 也没问题。
     """
-    base = "http://export.arxiv.org/api/query"
+    base = "https://export.arxiv.org/api/query"
     params = {
         "search_query": query,
         "sortBy": "submittedDate",
@@ -264,31 +534,39 @@ def fetch_arxiv(query: str, days: int, limit: int, extra_tags: List[str]|None=No
         "max_results": str(limit*2),
     }
     url = f"{base}?{urlencode(params)}"
-    d = feedparser.parse(url)
+    r = safe_get(url)
+    if r is None:
+        return []
+    try:
+        root = etree.fromstring(r.content)
+    except etree.XMLSyntaxError:
+        return []
+    cutoff = cutoff_date_str(days)
     items: List[Item] = []
-    for e in d.entries:
+    for e in root.iterfind("a:entry", ATOM_NS):
         # 标题/摘要
-        title = re.sub(r"\s+", " ", e.title).strip()
-        summary = clean_abs(e.summary)
+        title = _WS_RE.sub(" ", e.findtext("a:title", "", ATOM_NS)).strip()
+        summary = clean_abs(e.findtext("a:summary", "", ATOM_NS))
         # 链接（取外链 pdf/html）
         link = ""
-        for l in e.links:
+        for l in e.iterfind("a:link", ATOM_NS):
             if l.get("type") in ("text/html", "application/pdf"):
                 link = l.get("href")
                 break
-        link = link or e.link
+        link = link or e.findtext("a:id", "", ATOM_NS).strip()
+        if SEEN.seen_before(link):
+            continue
         # 时间
-        published = e.get("published") or e.get("updated") or ""
+        published = e.findtext("a:published", "", ATOM_NS) or e.findtext("a:updated", "", ATOM_NS)
         date_iso = iso_date(published) if published else today_jst_str()
-        if not within_days(date_iso, days):
+        if date_iso < cutoff:
             continue
         tags = ["Preprint"]
         if extra_tags:
             tags.extend(extra_tags)
-        host = urlparse(link).netloc
-        cover = f"https://www.google.com/s2/favicons?sz=256&domain={host}"
+        cover = favicon_url(_netloc(link))
         items.append(Item(
-            id=md5(link),
+            id=short_id(link),
             title=title,
             summary=summary,
             url=link,
@@ -302,6 +580,51 @@ def fetch_arxiv(query: str, days: int, limit: int, extra_tags: List[str]|None=No
     return items
 
 
+# ========== 跨天去重（布隆过滤器） ==========
+class SeenIds:
+    """
+    按 URL 记录此前各天已经发布过的条目，今天再出现时直接跳过后续所有抓取。
+    当天发布的先放在 pending 里，日期变了才并入布隆过滤器，所以同一天重跑结果不变。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.bloom = ScalableBloomFilter(initial_capacity=10000, error_rate=0.001)
+        self.pending: set[str] = set()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "rb") as f:
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except Exception:
+            logging.warning("ignoring unreadable seen-id filter: %s", self.path)
+            return
+        self.bloom = state["bloom"]
+        if state["date"] == today_jst_str():
+            self.pending = state["pending"]
+        else:
+            for key in state["pending"]:
+                self.bloom.add(key)
+
+    def seen_before(self, key: str) -> bool:
+        return key in self.bloom
+
+    def add(self, key: str) -> None:
+        self.pending.add(key)
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({"date": today_jst_str(), "bloom": self.bloom, "pending": self.pending}, f)
+        os.replace(tmp, self.path)
+
+
+SEEN = SeenIds(os.path.join(CACHE_DIR, "seen_ids.bloom"))
+
+
 # ========== 去重 ==========
 def dedupe(items: List[Item]) -> List[Item]:
     seen = set()
@@ -317,71 +640,81 @@ def dedupe(items: List[Item]) -> List[Item]:
 
 # ========== Markdown ==========
 def to_markdown(date_str: str, bucket: Dict[str, List[Item]]) -> str:
-    def mk(sec_name: str, arr: List[Item]) -> str:
+    total = sum(len(v) for v in bucket.values())
+    buf = io.StringIO()
+    buf.write(f"# 每日新闻（JST） · {date_str}\n\n共 {total} 条\n\n")
+    for sec_name, key in (("AI（生物医学）", "ai_biomed"), ("微流控", "microfluidics"), ("生物信息学", "bioinfo")):
+        arr = bucket[key]
         if not arr:
-            return f"### {sec_name}\n\n（今日暂无）\n\n"
-        lines = [f"### {sec_name}\n"]
+            buf.write(f"### {sec_name}\n\n（今日暂无）\n\n")
+            continue
+        buf.write(f"### {sec_name}\n")
         for it in arr:
             tags = ", ".join(it.tags) if it.tags else ""
-            lines.append(f"- **[{it.title}]({it.url})**  \n  来源：{it.source} · 发布：{it.time}  \n  标签：{tags}\n  \n  {it.summary}\n")
-        return "\n".join(lines) + "\n"
-
-    total = sum(len(v) for v in bucket.values())
-    head = f"# 每日新闻（JST） · {date_str}\n\n共 {total} 条\n\n"
-    md = head
-    md += mk("AI（生物医学）", bucket["ai_biomed"])
-    md += mk("微流控", bucket["microfluidics"])
-    md += mk("生物信息学", bucket["bioinfo"])
-    return md
+            buf.write(f"\n- **[{it.title}]({it.url})**  \n  来源：{it.source} · 发布：{it.time}  \n  标签：{tags}\n  \n  {it.summary}\n")
+        buf.write("\n")
+    return buf.getvalue()
 
 
 # ========== 主流程 ==========
 def main():
     os.makedirs(OUT_DIR, exist_ok=True)
     date_str = today_jst_str()
+    SEEN.load()
 
     # --- 三个模块的查询表达式（PubMed 高级语法）
     q_ai = '(("artificial intelligence"[Title/Abstract]) OR "deep learning"[Title/Abstract] OR "machine learning"[Title/Abstract]) AND (medical OR clinical OR radiology OR genomics OR bioinformatics)'
     q_micro = '(microfluidic OR "lab-on-a-chip" OR microdroplet) AND (biomedical OR diagnostic OR assay)'
     q_bioinfo = '(bioinformatics OR "single-cell" OR genomics OR transcriptomics OR proteomics) AND (algorithm OR pipeline OR method OR benchmark)'
 
-    # --- PubMed 主抓
-    ai_pub = build_pubmed_items(q_ai, DAYS_LOOKBACK, MAX_PER_SECTION, extra_tags=["Radiology"])
-    micro_pub = build_pubmed_items(q_micro, DAYS_LOOKBACK, max(15, MAX_PER_SECTION//2), extra_tags=["AST"])
-    bio_pub = build_pubmed_items(q_bioinfo, DAYS_LOOKBACK, max(20, MAX_PER_SECTION//2), extra_tags=["Single-cell"])
+    # --- 各模块互不依赖，整体并发抓取（NCBI 请求由 NCBI_LIMITER 统一限速）
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        jobs = {
+            # PubMed 主抓
+            "ai_pub": pool.submit(build_pubmed_items, q_ai, DAYS_LOOKBACK, MAX_PER_SECTION, extra_tags=["Radiology"]),
+            "micro_pub": pool.submit(build_pubmed_items, q_micro, DAYS_LOOKBACK, max(15, MAX_PER_SECTION//2), extra_tags=["AST"]),
+            "bio_pub": pool.submit(build_pubmed_items, q_bioinfo, DAYS_LOOKBACK, max(20, MAX_PER_SECTION//2), extra_tags=["Single-cell"]),
+        }
+        # arXiv 补充（可选）
+        if ENABLE_ARXIV:
+            jobs["ai_arxiv"] = pool.submit(fetch_arxiv, query='(ti:"medical" OR abs:"medical" OR ti:"radiology" OR abs:"radiology" OR ti:"biomedical" OR abs:"biomedical") AND (cat:cs.CV OR cat:cs.LG OR cat:eess.IV)', days=DAYS_LOOKBACK, limit=15, extra_tags=["Preprint"])
+            jobs["bio_arxiv"] = pool.submit(fetch_arxiv, query='(ti:"genomics" OR abs:"genomics" OR ti:"bioinformatics" OR abs:"bioinformatics" OR ti:"single-cell" OR abs:"single-cell") AND (cat:q-bio.GN OR cat:q-bio.QM OR cat:cs.LG)', days=DAYS_LOOKBACK, limit=10, extra_tags=["Preprint"])
+        results = {name: fut.result() for name, fut in jobs.items()}
 
-    # --- arXiv 补充（可选）
-    ai_arxiv = []
-    bio_arxiv = []
-    if ENABLE_ARXIV:
-        ai_arxiv = fetch_arxiv(query='(ti:"medical" OR abs:"medical" OR ti:"radiology" OR abs:"radiology" OR ti:"biomedical" OR abs:"biomedical") AND (cat:cs.CV OR cat:cs.LG OR cat:eess.IV)', days=DAYS_LOOKBACK, limit=15, extra_tags=["Preprint"])
-        bio_arxiv = fetch_arxiv(query='(ti:"genomics" OR abs:"genomics" OR ti:"bioinformatics" OR abs:"bioinformatics" OR ti:"single-cell" OR abs:"single-cell") AND (cat:q-bio.GN OR cat:q-bio.QM OR cat:cs.LG)', days=DAYS_LOOKBACK, limit=10, extra_tags=["Preprint"])
+    ai_pub, micro_pub, bio_pub = results["ai_pub"], results["micro_pub"], results["bio_pub"]
+    ai_arxiv = results.get("ai_arxiv", [])
+    bio_arxiv = results.get("bio_arxiv", [])
 
     ai_all = dedupe(ai_pub + ai_arxiv)[:MAX_PER_SECTION]
     micro_all = dedupe(micro_pub)[:max(12, MAX_PER_SECTION//2)]
     bio_all = dedupe(bio_pub + bio_arxiv)[:MAX_PER_SECTION]
-
-    # --- 打包 JSON
+    # 只记录最终发布的条目（被截掉的明天还有机会出现）
+    for it in ai_all + micro_all + bio_all:
+        SEEN.add(it.url)
+
+    # --- 打包 JSON（Item 为 dataclass，orjson 可直接序列化）
+    bucket = {
+        "ai_biomed": ai_all,
+        "microfluidics": micro_all,
+        "bioinfo": bio_all,
+    }
     payload = {
         "date": date_str,
-        "items": {
-            "ai_biomed": [asdict(x) for x in ai_all],
-            "microfluidics": [asdict(x) for x in micro_all],
-            "bioinfo": [asdict(x) for x in bio_all],
-        }
+        "items": bucket,
     }
 
     # --- 写文件
     json_path = os.path.join(OUT_DIR, f"{date_str}.json")
     md_path = os.path.join(OUT_DIR, f"{date_str}.md")
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    with open(json_path, "wb") as f:
+        f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
     with open(md_path, "w", encoding="utf-8") as f:
-        f.write(to_markdown(date_str, {
-            "ai_biomed": ai_all,
-            "microfluidics": micro_all,
-            "bioinfo": bio_all
-        }))
+        f.write(to_markdown(date_str, bucket))
+    SEEN.save()
+    # 过期条目只有再次请求同一 URL 时才会被替换，而每天的 efetch/esummary URL 都不同，
+    # 不清理的话 SQLite 文件会无限增长（CI 每次都要还原/保存整个文件）
+    SESSION.cache.delete(older_than=dt.timedelta(days=CACHE_MAX_AGE_DAYS))
+    SESSION.cache.responses.vacuum()  # 带 older_than 时 delete() 不会自己 VACUUM，文件不会变小
 
     print(f"[OK] wrote: {json_path}  and  {md_path}")
     print(f"Counts -> AI: {len(ai_all)} | Micro: {len(micro_all)} | Bioinfo: {len(bio_all)}")